@@ -1,14 +1,31 @@
 # database.py
 import os
-from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from redis import asyncio as aioredis
 from dotenv import load_dotenv
 load_dotenv()
 
 DATABASE_URL = os.getenv("DATABASE_URL")
-engine = create_engine(DATABASE_URL)
+# Any PostgreSQL URL works; the driver is always switched to asyncpg.
+ASYNC_DATABASE_URL = make_url(DATABASE_URL).set(drivername="postgresql+asyncpg")
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# A warm, sized pool; pre_ping drops dead connections and recycle beats server-side idle timeouts.
+engine = create_async_engine(
+    ASYNC_DATABASE_URL,
+    pool_size=20,
+    max_overflow=10,
+    pool_timeout=30,
+    pool_pre_ping=True,
+    pool_recycle=3600,
+)
 
-Base = declarative_base()
\ No newline at end of file
+# AsyncSession can't lazily reload expired attributes, so keep them after commit.
+AsyncSessionLocal = async_sessionmaker(engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
+Base = declarative_base()
+
+# Shared state such as the admin undo stacks lives in Redis, visible to every worker.
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+redis_client = aioredis.Redis.from_url(REDIS_URL, decode_responses=True)
@@ -0,0 +1,55 @@
+# geo_kernels.py
+# Numba-compiled clustering kernels over plain NumPy arrays.
+import numpy as np
+from numba import njit
+
+@njit(cache=True, nogil=True)
+def component_labels(src: np.ndarray, dst: np.ndarray, n: int) -> np.ndarray:
+    """
+    Labels the connected components of an undirected graph given as two edge
+    arrays over nodes 0..n-1, using union-find with path halving. Compiled
+    with Numba, so the loop runs natively over the int64 arrays and releases
+    the GIL while it does.
+    """
+    parent = np.arange(n)
+    for k in range(src.shape[0]):
+        a, b = src[k], dst[k]
+        while parent[a] != a:
+            parent[a] = parent[parent[a]]
+            a = parent[a]
+        while parent[b] != b:
+            parent[b] = parent[parent[b]]
+            b = parent[b]
+        if a < b:
+            parent[b] = a
+        elif b < a:
+            parent[a] = b
+
+    # Point every node straight at its root.
+    for i in range(n):
+        root = i
+        while parent[root] != root:
+            root = parent[root]
+        parent[i] = root
+    return parent
+
+def group_connected(src: np.ndarray, dst: np.ndarray) -> dict:
+    """
+    Groups the endpoints of integer-key edges (src[i], dst[i]) into connected components.
+    Returns a mapping of each component's root to all of its members (root included).
+    """
+    if not len(src):
+        return {}
+    # Renumber the keys densely so the union-find can index arrays with them.
+    nodes, dense = np.unique(np.concatenate((src, dst)), return_inverse=True)
+    labels = component_labels(dense[:len(src)], dense[len(src):], len(nodes))
+
+    # Sort by label so each component is one contiguous run of node indices.
+    order = np.argsort(labels, kind="stable")
+    runs = np.split(order, np.flatnonzero(np.diff(labels[order])) + 1)
+    return {int(nodes[labels[run[0]]]): nodes[run].tolist() for run in runs}
+
+def warm_up():
+    """Triggers compilation of the Numba kernels so the first request doesn't pay for it."""
+    edges = np.array([0], dtype=np.int64)
+    component_labels(edges, edges, 1)
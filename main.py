@@ -1,216 +1,428 @@
 # main.py
-from fastapi import FastAPI, HTTPException, Depends
+from fastapi import FastAPI, HTTPException, Depends, Query, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import Response
 from typing import List, Optional
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import desc
+from contextlib import asynccontextmanager, suppress
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload, raiseload, aliased
+from sqlalchemy import desc, select, update, func, tuple_, literal, bindparam
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import IntegrityError
+from cachetools import LRUCache, TTLCache
+import asyncio
+import logging
 import uuid
-import requests
-from math import radians, sin, cos, sqrt, atan2
+import orjson
+import httpx
+import numpy as np
 
-import models, schemas
-from database import SessionLocal, engine
+import models, schemas, schemas_fast
+from geo_kernels import group_connected, warm_up
+from database import AsyncSessionLocal, engine, redis_client
 
-models.Base.metadata.create_all(bind=engine)
+logger = logging.getLogger(__name__)
 
-app = FastAPI(title="Full-Stack Civic Sense Complaint System")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Pay the Numba compile (or cache load) once at boot, not on the first clustering request.
+    warm_up()
+    upvote_sync_task = asyncio.create_task(upvote_sync_loop())
+    yield
+    upvote_sync_task.cancel()
+    with suppress(asyncio.CancelledError):
+        await upvote_sync_task
+    # Recount what this process was voted on since the last pass.
+    if pending_upvote_syncs:
+        await recount_upvotes(list(pending_upvote_syncs))
+    await geocoding_client.aclose()
+    await redis_client.aclose()
+    await engine.dispose()
+
+app = FastAPI(title="Full-Stack Civic Sense Complaint System", lifespan=lifespan)
 
 app.add_middleware(CORSMiddleware, allow_origins=["*"], allow_credentials=True, allow_methods=["*"], allow_headers=["*"])
 
-admin_action_stacks = {}
+# Each admin's undo stack is a Redis list: LPUSH to record an action, LPOP to undo it.
+UNDO_STACK_TTL_SECONDS = 24 * 60 * 60
+
+def undo_stack_key(admin_id: uuid.UUID) -> str:
+    return f"undo:{admin_id}"
+
+# One shared client keeps connections to the geocoding API alive between requests.
+geocoding_client = httpx.AsyncClient(http2=True, timeout=10.0)
+city_coords_cache = LRUCache(maxsize=10_000)
+# Cities the API doesn't know, remembered briefly so each submission doesn't ask again.
+city_miss_cache = TTLCache(maxsize=10_000, ttl=10 * 60)
+# Admin flags change rarely, so a short-lived cache saves a lookup per admin action.
+admin_flag_cache = TTLCache(maxsize=1024, ttl=60)
+
+# Read-only endpoints select plain columns, skipping ORM object construction.
+COMPLAINT_COLUMNS = [models.Complaint.__table__.c[name] for name in schemas.Complaint.model_fields]
+# Largest value of the int4 complaints.upvotes column, for validating cursors.
+INT4_MAX = 2**31 - 1
+
+def status_is(status: schemas.ComplaintStatus):
+    # Rendered inline, since a generic plan for status = $1 can't use the pending partial index.
+    return models.Complaint.status == bindparam(None, status, type_=models.complaint_status, literal_execute=True)
+
+# complaints.upvotes is a cached count; votes only insert into upvotes and are recounted in the background.
+UPVOTE_SYNC_INTERVAL_SECONDS = 5
+pending_upvote_syncs: set = set()
 
-def get_db():
-    db = SessionLocal()
+def live_upvote_count():
+    return (
+        select(func.count())
+        .where(models.Upvote.complaint_id == models.Complaint.pk)
+        .scalar_subquery()
+        .label("upvotes")
+    )
+
+async def sync_upvote_counts(db: AsyncSession, complaint_pks: Optional[List[int]] = None):
+    counts = select(models.Upvote.complaint_id, func.count().label("n")).group_by(models.Upvote.complaint_id)
+    if complaint_pks is not None:
+        counts = counts.where(models.Upvote.complaint_id.in_(complaint_pks))
+    counts = counts.subquery()
+    await db.execute(
+        update(models.Complaint)
+        # Only raise counts, so a recount from an older snapshot cannot undo a newer one.
+        .where(models.Complaint.pk == counts.c.complaint_id, func.coalesce(models.Complaint.upvotes, 0) < counts.c.n)
+        .values(upvotes=counts.c.n)
+        .execution_options(synchronize_session=False)
+    )
+    await db.commit()
+
+async def recount_upvotes(complaint_pks: Optional[List[int]] = None) -> bool:
     try:
-        yield db
-    finally:
-        db.close()
+        async with AsyncSessionLocal() as db:
+            await sync_upvote_counts(db, complaint_pks)
+        return True
+    except Exception:
+        logger.exception("Upvote count sync failed")
+        return False
+
+async def upvote_sync_loop():
+    # The first pass recounts every complaint until it succeeds; later passes only those voted on here.
+    caught_up = False
+    while True:
+        await asyncio.sleep(UPVOTE_SYNC_INTERVAL_SECONDS)
+        if caught_up and not pending_upvote_syncs:
+            continue
+        complaint_pks = list(pending_upvote_syncs)
+        pending_upvote_syncs.clear()
+        synced = False
+        try:
+            synced = await recount_upvotes(complaint_pks if caught_up else None)
+        finally:
+            # Also covers cancellation mid-recount, so shutdown can flush them.
+            if not synced:
+                pending_upvote_syncs.update(complaint_pks)
+        caught_up = caught_up or synced
+
+# One session per request, so get_db is just an attribute lookup.
+@app.middleware("http")
+async def db_session_middleware(request: Request, call_next):
+    async with AsyncSessionLocal() as db:
+        request.state.db = db
+        return await call_next(request)
+
+def get_db(request: Request) -> AsyncSession:
+    return request.state.db
 
 # --- Geocoding and Distance Calculation Helpers ---
-def get_coords_for_city(city: str) -> Optional[tuple]:
+def city_cache_key(city: str) -> str:
+    return city.strip().lower()
+
+async def get_coords_for_city(city: str, db: AsyncSession) -> Optional[tuple]:
+    """
+    Looks a city up in the in-process cache, then the cities table, and only
+    calls the geocoding API for cities seen for the first time. Coordinates
+    from the API are only added to the caller's transaction; the caller caches
+    them once that commits.
+    """
+    key = city_cache_key(city)
+    if key in city_coords_cache:
+        return city_coords_cache[key]
+    if key in city_miss_cache:
+        return None
+
+    known = (await db.execute(select(models.City).where(models.City.name == key))).scalar_one_or_none()
+    if known:
+        city_coords_cache[key] = (known.latitude, known.longitude)
+        return city_coords_cache[key]
+    # End the read so the connection isn't held idle in transaction during the API call.
+    await db.rollback()
+
     try:
-        url = f"https://geocoding-api.open-meteo.com/v1/search?name={city}&count=1"
-        response = requests.get(url)
+        response = await geocoding_client.get(
+            "https://geocoding-api.open-meteo.com/v1/search", params={"name": city, "count": 1}
+        )
         response.raise_for_status()
         data = response.json()
         if "results" in data and len(data["results"]) > 0:
             location = data["results"][0]
-            return location["latitude"], location["longitude"]
-    except requests.exceptions.RequestException as e:
+            coords = location["latitude"], location["longitude"]
+            # Persisted together with the caller's commit.
+            await db.execute(
+                pg_insert(models.City)
+                .values(name=key, latitude=coords[0], longitude=coords[1])
+                .on_conflict_do_nothing(index_elements=["name"])
+            )
+            return coords
+        # The API answered but doesn't know the city.
+        city_miss_cache[key] = True
+    except (httpx.HTTPError, ValueError, KeyError) as e:
+        # Bad JSON or a result without coordinates; not cached, so the next submission retries.
         print(f"Geocoding API error: {e}")
     return None
 
-def haversine_distance(lat1, lon1, lat2, lon2) -> float:
-    R = 6371.0
-    lat1_rad, lon1_rad = radians(lat1), radians(lon1)
-    lat2_rad, lon2_rad = radians(lat2), radians(lon2)
-    
-    dlon = lon2_rad - lon1_rad
-    dlat = lat2_rad - lat1_rad
+def msgspec_response(obj) -> Response:
+    return Response(content=schemas_fast.encoder.encode(obj), media_type="application/json")
 
-    a = sin(dlat / 2)**2 + cos(lat1_rad) * cos(lat2_rad) * sin(dlon / 2)**2
-    c = 2 * atan2(sqrt(a), sqrt(1 - a))
-    
-    return R * c
+def model_response(model, status_code: int = 200) -> Response:
+    # pydantic-core writes the JSON bytes directly, skipping FastAPI's jsonable_encoder.
+    return Response(content=model.model_dump_json(), status_code=status_code, media_type="application/json")
+
+async def is_admin(db: AsyncSession, user_id: uuid.UUID) -> bool:
+    if user_id not in admin_flag_cache:
+        flag = (await db.execute(select(models.User.is_admin).where(models.User.id == user_id))).scalar()
+        admin_flag_cache[user_id] = flag is True
+    return admin_flag_cache[user_id]
 
 # --- User Authentication ---
-@app.post("/register", response_model=schemas.User, status_code=201)
-def register_user(user: schemas.UserCreate, db: Session = Depends(get_db)):
-    if db.query(models.User).filter(models.User.username == user.username).first():
-        raise HTTPException(status_code=400, detail="Username already exists")
-    new_user = models.User(username=user.username, password=user.password)
+# Routes encode their own responses; response_model=None stops FastAPI validating them again.
+@app.post("/register", response_model=None, responses={201: {"model": schemas.User}}, status_code=201)
+async def register_user(user: schemas.UserCreate, db: AsyncSession = Depends(get_db)):
+    # A new user has no complaints; setting it explicitly avoids a lazy load when serializing.
+    new_user = models.User(username=user.username, password=user.password, complaints=[])
     db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
-    return new_user
+    try:
+        await db.commit()
+    except IntegrityError:
+        # The unique index on username rejects duplicates.
+        await db.rollback()
+        raise HTTPException(status_code=400, detail="Username already exists")
+    return model_response(schemas.User.from_orm_fast(new_user), status_code=201)
 
-@app.post("/login", response_model=schemas.User)
-def login_user(login_request: schemas.LoginRequest, db: Session = Depends(get_db)):
-    user = db.query(models.User).filter(models.User.username == login_request.username).first()
+@app.post("/login", response_model=None, responses={200: {"model": schemas.User}})
+async def login_user(login_request: schemas.LoginRequest, db: AsyncSession = Depends(get_db)):
+    result = await db.execute(select(models.User).where(models.User.username == login_request.username))
+    user = result.scalar_one_or_none()
     if not user or user.password != login_request.password:
         raise HTTPException(status_code=401, detail="Invalid username or password")
-    return user
+    return model_response(schemas.User.from_orm_fast(user))
 
 # --- Complaint Management Endpoints (Unchanged) ---
-@app.post("/complaint", response_model=schemas.Complaint, status_code=201)
-def submit_complaint(complaint: schemas.ComplaintCreate, db: Session = Depends(get_db)):
-    if not db.query(models.User).filter(models.User.id == complaint.owner_id).first():
-        raise HTTPException(status_code=404, detail="Owner user not found")
-    
-    new_complaint = models.Complaint(**complaint.model_dump())
-    
-    coords = get_coords_for_city(complaint.location)
-    if coords:
-        new_complaint.latitude, new_complaint.longitude = coords
+@app.post("/complaint", response_model=None, responses={201: {"model": schemas.Complaint}}, status_code=201)
+async def submit_complaint(complaint: schemas.ComplaintCreate, db: AsyncSession = Depends(get_db)):
+    coords = await get_coords_for_city(complaint.location, db)
+    latitude, longitude = coords or (None, None)
+    # Every column the response reads is set, so none needs a lazy load after the INSERT.
+    new_complaint = models.Complaint(**complaint.model_dump(), latitude=latitude, longitude=longitude, cluster_id=None)
         
     db.add(new_complaint)
-    db.commit()
-    db.refresh(new_complaint)
-    return new_complaint
+    try:
+        await db.commit()
+    except IntegrityError:
+        # The owner_id foreign key rejects complaints from unknown users.
+        await db.rollback()
+        raise HTTPException(status_code=404, detail="Owner user not found")
+    if coords:
+        # Only now is a newly geocoded city stored in the cities table.
+        city_coords_cache[city_cache_key(complaint.location)] = coords
+    # Server-generated columns came back with the INSERT ... RETURNING, so no refresh is needed.
+    return model_response(schemas.Complaint.from_orm_fast(new_complaint), status_code=201)
 
-@app.get("/complaints", response_model=List[schemas.Complaint])
-def get_all_complaints(db: Session = Depends(get_db)):
-    return db.query(models.Complaint).order_by(desc(models.Complaint.upvotes)).all()
+@app.get("/complaints", response_model=None, responses={200: {"model": schemas.ComplaintPage}})
+async def get_all_complaints(
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = None,
+    status: Optional[List[schemas.ComplaintStatus]] = Query(None),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Returns complaints by upvotes (highest first), one page at a time. Pass the
+    returned next_cursor back as cursor to get the following page, with the same
+    status filter. status may be repeated to match any of several statuses.
+    """
+    query = select(*COMPLAINT_COLUMNS).order_by(desc(models.Complaint.upvotes), desc(models.Complaint.id))
+    if status:
+        # A single status compares with a literal so status=Pending can use the pending partial index.
+        query = query.where(status_is(status[0]) if len(status) == 1 else models.Complaint.status.in_(status))
+    if cursor:
+        try:
+            upvotes, complaint_id = cursor.split("_", 1)
+            after = (int(upvotes), uuid.UUID(complaint_id))
+            if not 0 <= after[0] <= INT4_MAX:
+                raise ValueError(upvotes)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        query = query.where(tuple_(models.Complaint.upvotes, models.Complaint.id) < after)
+
+    # Fetch one extra row to know whether another page exists.
+    complaints = (await db.execute(query.limit(limit + 1))).mappings().all()
+    next_cursor = None
+    if len(complaints) > limit:
+        complaints = complaints[:limit]
+        last = complaints[-1]
+        next_cursor = f"{last['upvotes']}_{last['id']}"
+    return msgspec_response(schemas_fast.ComplaintPageOut(
+        items=[schemas_fast.ComplaintOut.from_row(row) for row in complaints], next_cursor=next_cursor
+    ))
 
 # --- Upvote and Most-Voted Endpoints ---
-@app.post("/complaint/{complaint_id}/upvote", response_model=schemas.Complaint)
-def upvote_complaint(complaint_id: uuid.UUID, vote_request: schemas.UpvoteRequest, db: Session = Depends(get_db)):
-    complaint = db.query(models.Complaint).filter(models.Complaint.id == complaint_id).first()
-    if not complaint: raise HTTPException(status_code=404, detail="Complaint not found")
-    if complaint.status != "Pending": raise HTTPException(status_code=400, detail="Cannot vote on a resolved complaint")
-    if db.query(models.Upvote).filter(models.Upvote.complaint_id == complaint_id, models.Upvote.user_id == vote_request.user_id).first():
+@app.post("/complaint/{complaint_id}/upvote", response_model=None, responses={200: {"model": schemas.Complaint}})
+async def upvote_complaint(complaint_id: uuid.UUID, vote_request: schemas.UpvoteRequest, db: AsyncSession = Depends(get_db)):
+    # One INSERT ... SELECT records the vote; constraints reject duplicate votes and unknown users.
+    target = select(models.Complaint.pk, literal(vote_request.user_id, models.Upvote.user_id.type)).where(
+        models.Complaint.id == complaint_id, models.Complaint.status == "Pending"
+    )
+    try:
+        vote = await db.execute(
+            pg_insert(models.Upvote)
+            .from_select(["complaint_id", "user_id"], target)
+            .on_conflict_do_nothing(index_elements=["complaint_id", "user_id"])
+            .returning(models.Upvote.complaint_id)
+        )
+        complaint_pk = vote.scalar()
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(status_code=404, detail="User not found")
+    if complaint_pk is None:
+        await db.rollback()
+        status = (await db.execute(select(models.Complaint.status).where(models.Complaint.id == complaint_id))).scalar()
+        if status is None:
+            raise HTTPException(status_code=404, detail="Complaint not found")
+        if status != "Pending":
+            raise HTTPException(status_code=400, detail="Cannot vote on a resolved complaint")
         raise HTTPException(status_code=400, detail="You have already voted for this complaint")
-    db.add(models.Upvote(user_id=vote_request.user_id, complaint_id=complaint_id))
-    complaint.upvotes += 1
-    db.commit()
-    db.refresh(complaint)
-    return complaint
+    await db.commit()
+    pending_upvote_syncs.add(complaint_pk)
 
-@app.get("/complaints/most_voted", response_model=Optional[schemas.Complaint])
-def get_most_voted_complaint(db: Session = Depends(get_db)):
-    return db.query(models.Complaint).filter(models.Complaint.status == "Pending").order_by(desc(models.Complaint.upvotes)).first()
+    columns = [live_upvote_count() if column.name == "upvotes" else column for column in COMPLAINT_COLUMNS]
+    row = (await db.execute(select(*columns).where(models.Complaint.pk == complaint_pk))).mappings().one()
+    return model_response(schemas.Complaint.from_orm_fast(row))
+
+@app.get("/complaints/most_voted", response_model=None, responses={200: {"model": Optional[schemas.Complaint]}})
+async def get_most_voted_complaint(db: AsyncSession = Depends(get_db)):
+    result = await db.execute(
+        select(*COMPLAINT_COLUMNS).where(status_is("Pending")).order_by(desc(models.Complaint.upvotes)).limit(1)
+    )
+    row = result.mappings().first()
+    if not row:
+        return Response(b"null", media_type="application/json")
+    return model_response(schemas.Complaint.from_orm_fast(row))
 
 # --- Admin Status Update and Undo  ---
-@app.put("/admin/complaint/{complaint_id}/status", response_model=schemas.AdminActionResponse)
-def update_complaint_status_by_admin(complaint_id: uuid.UUID, admin_id: uuid.UUID, status: str, db: Session = Depends(get_db)):
-    admin_user = db.query(models.User).filter(models.User.id == admin_id).first()
-    if not admin_user or not admin_user.is_admin:
+@app.put("/admin/complaint/{complaint_id}/status", response_model=None, responses={200: {"model": schemas.AdminActionResponse}})
+async def update_complaint_status_by_admin(complaint_id: uuid.UUID, admin_id: uuid.UUID, status: schemas.ComplaintStatus, db: AsyncSession = Depends(get_db)):
+    if not await is_admin(db, admin_id):
         raise HTTPException(status_code=403, detail="Forbidden")
 
-    complaint = db.query(models.Complaint).filter(models.Complaint.id == complaint_id).first()
+    complaint = (await db.execute(select(models.Complaint).where(models.Complaint.id == complaint_id))).scalar_one_or_none()
     if not complaint:
         raise HTTPException(status_code=404, detail="Complaint not found")
         
-    old_status = complaint.status
-    if old_status != status:
-        if admin_id not in admin_action_stacks:
-            admin_action_stacks[admin_id] = []
-        admin_action_stacks[admin_id].append({"complaint_id": complaint_id, "previous_status": old_status})
+    key = undo_stack_key(admin_id)
+    if complaint.status == status:
+        return model_response(schemas.AdminActionResponse.from_orm_fast(complaint, await redis_client.llen(key)))
+
+    # Record the undo entry first and take it back if the commit fails.
+    action = orjson.dumps({"complaint_id": complaint_id, "previous_status": complaint.status})
+    async with redis_client.pipeline(transaction=True) as pipe:
+        pipe.lpush(key, action)
+        pipe.expire(key, UNDO_STACK_TTL_SECONDS)
+        actions_to_undo, _ = await pipe.execute()
 
     complaint.status = status
-    db.commit()
-    db.refresh(complaint)
-    return {"updated_complaint": complaint, "actions_to_undo": len(admin_action_stacks.get(admin_id, []))}
-
-@app.post("/admin/undo", response_model=schemas.AdminActionResponse)
-def undo_last_admin_action(request: schemas.UndoRequest, db: Session = Depends(get_db)):
-    admin_stack = admin_action_stacks.get(request.admin_id)
-    if not admin_stack:
+    try:
+        await db.commit()
+    except Exception:
+        await redis_client.lrem(key, 1, action)
+        raise
+    return model_response(schemas.AdminActionResponse.from_orm_fast(complaint, actions_to_undo))
+
+@app.post("/admin/undo", response_model=None, responses={200: {"model": schemas.AdminActionResponse}})
+async def undo_last_admin_action(request: schemas.UndoRequest, db: AsyncSession = Depends(get_db)):
+    if not await is_admin(db, request.admin_id):
+        raise HTTPException(status_code=403, detail="Forbidden")
+
+    key = undo_stack_key(request.admin_id)
+    raw_action = await redis_client.lpop(key)
+    if raw_action is None:
         raise HTTPException(status_code=404, detail="No actions to undo")
 
-    last_action = admin_stack.pop()
-    complaint = db.query(models.Complaint).filter(models.Complaint.id == last_action["complaint_id"]).first()
+    last_action = orjson.loads(raw_action)
+    complaint_id = uuid.UUID(last_action["complaint_id"])
+    complaint = (await db.execute(select(models.Complaint).where(models.Complaint.id == complaint_id))).scalar_one_or_none()
     if not complaint:
         raise HTTPException(status_code=404, detail="Original complaint not found")
 
     complaint.status = last_action["previous_status"]
-    db.commit()
-    db.refresh(complaint)
-    return {"updated_complaint": complaint, "actions_to_undo": len(admin_stack)}
+    try:
+        await db.commit()
+    except Exception:
+        # Put the action back so the undo can be retried.
+        await redis_client.lpush(key, raw_action)
+        raise
+    return model_response(schemas.AdminActionResponse.from_orm_fast(complaint, await redis_client.llen(key)))
 
 # --- New Global Clustering Endpoint ---
 @app.post("/admin/cluster-all", status_code=204)
-def create_all_clusters(request: schemas.ClusterRequest, db: Session = Depends(get_db)):
+async def create_all_clusters(request: schemas.ClusterRequest, db: AsyncSession = Depends(get_db)):
     """
     Finds all interconnected groups of complaints within the given radius
     and assigns them to clusters.
     """
-    all_pending = db.query(models.Complaint).filter(
-        models.Complaint.status == "Pending",
-        models.Complaint.latitude.isnot(None)
-    ).all()
-
     # Reset existing clusters before recalculating
-    for complaint in all_pending:
-        complaint.cluster_id = None
-    db.commit()
+    await db.execute(update(models.Complaint).where(models.Complaint.status == "Pending").values(cluster_id=None))
 
-    visited = set()
-    for complaint in all_pending:
-        if complaint.id in visited:
-            continue
+    # PostGIS finds every pair within the radius and returns them as two arrays for NumPy.
+    a, b = aliased(models.Complaint), aliased(models.Complaint)
+    result = await db.execute(
+        select(func.array_agg(a.pk), func.array_agg(b.pk))
+        .select_from(a)
+        .join(b, a.pk < b.pk)
+        .where(
+            a.status == "Pending", b.status == "Pending",
+            func.ST_DWithin(a.geom, b.geom, request.radius_km * 1000, request.precision == "accurate"),
+        )
+    )
+    src, dst = result.one()
+    # Run the merge in the threadpool so a large graph doesn't stall the event loop.
+    clusters = await run_in_threadpool(
+        group_connected, np.array(src or [], dtype=np.int64), np.array(dst or [], dtype=np.int64)
+    )
 
-        # Start a new cluster discovery (BFS)
-        parent_complaint = complaint
-        current_cluster_members = {parent_complaint}
-        queue = [parent_complaint]
-        visited.add(parent_complaint.id)
-
-        while queue:
-            current = queue.pop(0)
-            for other in all_pending:
-                if other.id in visited:
-                    continue
-                
-                distance = haversine_distance(
-                    current.latitude, current.longitude,
-                    other.latitude, other.longitude
-                )
-
-                if distance <= request.radius_km:
-                    visited.add(other.id)
-                    current_cluster_members.add(other)
-                    queue.append(other)
-        
-        # After finding all connected complaints, if the group has more than one member,
-        # assign them to a cluster.
-        if len(current_cluster_members) > 1:
-            for member in current_cluster_members:
-                member.cluster_id = parent_complaint.id
+    if clusters:
+        # cluster_id points at the parent's public UUID, so look those up for the roots only.
+        parent_ids = dict((await db.execute(
+            select(models.Complaint.pk, models.Complaint.id).where(models.Complaint.pk.in_(list(clusters)))
+        )).all())
+
+        # Each group's root becomes its parent; all members are assigned in one executemany UPDATE.
+        assignments = [
+            {"pk": member, "cluster_id": parent_ids[root]}
+            for root, members in clusters.items()
+            for member in members
+        ]
+        await db.execute(update(models.Complaint), assignments)
     
-    db.commit()
+    await db.commit()
 
 # --- Get Clustered Complaints ---
-@app.get("/complaints/clustered", response_model=List[schemas.ClusteredComplaintResponse])
-def get_clustered_complaints(db: Session = Depends(get_db)):
-    cluster_parents = db.query(models.Complaint).filter(
+@app.get("/complaints/clustered", response_model=None, responses={200: {"model": List[schemas.ClusteredComplaintResponse]}})
+async def get_clustered_complaints(db: AsyncSession = Depends(get_db)):
+    result = await db.execute(select(models.Complaint).where(
         models.Complaint.id == models.Complaint.cluster_id
-    ).options(joinedload(models.Complaint.cluster_children)).all()
+    ).options(selectinload(models.Complaint.cluster_children), raiseload("*")))
+    cluster_parents = result.scalars().all()
 
     response = []
     for parent in cluster_parents:
-        response.append({
-            "parent": parent,
-            "children": [child for child in parent.cluster_children if child.id != parent.id]
-        })
-    return response
\ No newline at end of file
+        response.append(schemas_fast.ClusteredComplaintOut(
+            parent=schemas_fast.ComplaintOut.from_row(parent),
+            children=[schemas_fast.ComplaintOut.from_row(child) for child in parent.cluster_children if child.id != parent.id],
+        ))
+    return msgspec_response(response)
\ No newline at end of file
@@ -0,0 +1,64 @@
+"""baseline schema, as created by Base.metadata.create_all before migrations
+
+Revision ID: 0000
+Revises:
+Create Date: 2026-10-15
+"""
+from alembic import context, op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+
+revision = "0000"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def table_exists(name: str) -> bool:
+    # Databases from before migrations already have these tables; only create
+    # what is missing so `alembic upgrade head` works on them as-is.
+    if context.is_offline_mode():
+        return False
+    return sa.inspect(op.get_bind()).has_table(name)
+
+
+def upgrade():
+    if not table_exists("users"):
+        op.create_table(
+            "users",
+            sa.Column("id", UUID(as_uuid=True), primary_key=True),
+            sa.Column("username", sa.String()),
+            sa.Column("password", sa.String()),
+            sa.Column("is_admin", sa.Boolean()),
+        )
+        op.create_index("ix_users_username", "users", ["username"], unique=True)
+
+    if not table_exists("complaints"):
+        op.create_table(
+            "complaints",
+            sa.Column("id", UUID(as_uuid=True), primary_key=True),
+            sa.Column("description", sa.String()),
+            sa.Column("category", sa.String()),
+            sa.Column("location", sa.String()),
+            sa.Column("upvotes", sa.Integer()),
+            sa.Column("status", sa.String()),
+            sa.Column("created_at", sa.DateTime()),
+            sa.Column("latitude", sa.Float()),
+            sa.Column("longitude", sa.Float()),
+            sa.Column("cluster_id", UUID(as_uuid=True), sa.ForeignKey("complaints.id")),
+            sa.Column("owner_id", UUID(as_uuid=True), sa.ForeignKey("users.id")),
+        )
+        op.create_index("ix_complaints_description", "complaints", ["description"])
+        op.create_index("ix_complaints_category", "complaints", ["category"])
+
+    if not table_exists("upvotes"):
+        op.create_table(
+            "upvotes",
+            sa.Column("user_id", UUID(as_uuid=True), sa.ForeignKey("users.id"), primary_key=True),
+            sa.Column("complaint_id", UUID(as_uuid=True), sa.ForeignKey("complaints.id"), primary_key=True),
+        )
+
+
+def downgrade():
+    # No-op: the tables may predate migrations, so downgrading never drops them or their data.
+    pass
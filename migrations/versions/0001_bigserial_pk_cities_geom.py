@@ -0,0 +1,85 @@
+"""key complaints by a bigserial pk; add cities, PostGIS geom and listing indexes
+
+Revision ID: 0001
+Revises: 0000
+Create Date: 2026-10-15
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+from geoalchemy2 import Geography
+
+revision = "0001"
+down_revision = "0000"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute("CREATE EXTENSION IF NOT EXISTS postgis")
+
+    op.create_table(
+        "cities",
+        sa.Column("name", sa.String(), primary_key=True),
+        sa.Column("latitude", sa.Float(), nullable=False),
+        sa.Column("longitude", sa.Float(), nullable=False),
+    )
+
+    # Existing rows are numbered as the column is added.
+    op.execute("ALTER TABLE complaints ADD COLUMN pk BIGSERIAL NOT NULL")
+
+    # Point votes at the new key before the UUID primary key goes away.
+    op.add_column("upvotes", sa.Column("complaint_pk", sa.BigInteger()))
+    op.execute("UPDATE upvotes SET complaint_pk = complaints.pk FROM complaints WHERE complaints.id = upvotes.complaint_id")
+    op.drop_constraint("upvotes_complaint_id_fkey", "upvotes", type_="foreignkey")
+    op.drop_constraint("upvotes_pkey", "upvotes", type_="primary")
+    op.drop_column("upvotes", "complaint_id")
+    op.alter_column("upvotes", "complaint_pk", new_column_name="complaint_id", nullable=False)
+
+    # The cluster self-FK depends on the old primary key; it moves to a unique index on id.
+    op.drop_constraint("complaints_cluster_id_fkey", "complaints", type_="foreignkey")
+    op.drop_constraint("complaints_pkey", "complaints", type_="primary")
+    op.create_primary_key("complaints_pkey", "complaints", ["pk"])
+    op.alter_column("complaints", "id", existing_type=UUID(as_uuid=True), nullable=False)
+    op.create_index("ix_complaints_id", "complaints", ["id"], unique=True)
+    op.create_foreign_key(None, "complaints", "complaints", ["cluster_id"], ["id"])
+
+    op.create_primary_key("upvotes_pkey", "upvotes", ["user_id", "complaint_id"])
+    op.create_foreign_key(None, "upvotes", "complaints", ["complaint_id"], ["pk"])
+
+    op.add_column("complaints", sa.Column("geom", Geography(geometry_type="POINT", srid=4326, spatial_index=False)))
+    op.execute(
+        "UPDATE complaints SET geom = ST_SetSRID(ST_MakePoint(longitude, latitude), 4326)::geography "
+        "WHERE latitude IS NOT NULL"
+    )
+    op.create_index("ix_complaints_cluster_id", "complaints", ["cluster_id"])
+    op.create_index("ix_complaints_status_upvotes_desc", "complaints", ["status", sa.text("upvotes DESC")])
+    op.create_index("ix_complaints_upvotes_id_desc", "complaints", [sa.text("upvotes DESC"), sa.text("id DESC")])
+    op.create_index("idx_complaints_geom", "complaints", ["geom"], postgresql_using="gist")
+
+
+def downgrade():
+    op.drop_index("idx_complaints_geom", table_name="complaints")
+    op.drop_index("ix_complaints_upvotes_id_desc", table_name="complaints")
+    op.drop_index("ix_complaints_status_upvotes_desc", table_name="complaints")
+    op.drop_index("ix_complaints_cluster_id", table_name="complaints")
+    op.drop_column("complaints", "geom")
+
+    op.add_column("upvotes", sa.Column("complaint_uuid", UUID(as_uuid=True)))
+    op.execute("UPDATE upvotes SET complaint_uuid = complaints.id FROM complaints WHERE complaints.pk = upvotes.complaint_id")
+    op.drop_constraint("upvotes_complaint_id_fkey", "upvotes", type_="foreignkey")
+    op.drop_constraint("upvotes_pkey", "upvotes", type_="primary")
+    op.drop_column("upvotes", "complaint_id")
+    op.alter_column("upvotes", "complaint_uuid", new_column_name="complaint_id", nullable=False)
+
+    op.drop_constraint("complaints_cluster_id_fkey", "complaints", type_="foreignkey")
+    op.drop_index("ix_complaints_id", table_name="complaints")
+    op.drop_constraint("complaints_pkey", "complaints", type_="primary")
+    op.create_primary_key("complaints_pkey", "complaints", ["id"])
+    op.drop_column("complaints", "pk")
+    op.create_foreign_key(None, "complaints", "complaints", ["cluster_id"], ["id"])
+
+    op.create_primary_key("upvotes_pkey", "upvotes", ["user_id", "complaint_id"])
+    op.create_foreign_key(None, "upvotes", "complaints", ["complaint_id"], ["id"])
+
+    op.drop_table("cities")
@@ -0,0 +1,38 @@
+"""generate complaints.geom from latitude/longitude and index it with SP-GiST
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-15
+"""
+from alembic import op
+import sqlalchemy as sa
+from geoalchemy2 import Geography
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+GEOM_EXPRESSION = "ST_SetSRID(ST_MakePoint(longitude, latitude), 4326)::geography"
+
+
+def upgrade():
+    op.drop_index("idx_complaints_geom", table_name="complaints")
+    op.drop_column("complaints", "geom")
+    op.add_column(
+        "complaints",
+        sa.Column(
+            "geom",
+            Geography(geometry_type="POINT", srid=4326, spatial_index=False),
+            sa.Computed(GEOM_EXPRESSION, persisted=True),
+        ),
+    )
+    op.create_index("ix_complaints_geom_spgist", "complaints", ["geom"], postgresql_using="spgist")
+
+
+def downgrade():
+    op.drop_index("ix_complaints_geom_spgist", table_name="complaints")
+    op.drop_column("complaints", "geom")
+    op.add_column("complaints", sa.Column("geom", Geography(geometry_type="POINT", srid=4326, spatial_index=False)))
+    op.execute(f"UPDATE complaints SET geom = {GEOM_EXPRESSION} WHERE latitude IS NOT NULL")
+    op.create_index("idx_complaints_geom", "complaints", ["geom"], postgresql_using="gist")
@@ -0,0 +1,37 @@
+"""store complaints.created_at as timestamptz with a server-side default
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-15
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Existing values were written by datetime.utcnow(), i.e. naive UTC.
+    op.alter_column(
+        "complaints",
+        "created_at",
+        type_=sa.DateTime(timezone=True),
+        postgresql_using="created_at AT TIME ZONE 'UTC'",
+        server_default=sa.func.now(),
+    )
+    op.execute("UPDATE complaints SET created_at = now() WHERE created_at IS NULL")
+    op.alter_column("complaints", "created_at", nullable=False)
+
+
+def downgrade():
+    op.alter_column(
+        "complaints",
+        "created_at",
+        type_=sa.DateTime(),
+        postgresql_using="created_at AT TIME ZONE 'UTC'",
+        server_default=None,
+        nullable=True,
+    )
@@ -0,0 +1,32 @@
+"""replace ix_complaints_cluster_id with a partial (cluster_id, upvotes DESC, id) index
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-15
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # CONCURRENTLY cannot run inside the migration transaction.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_complaints_cluster_upvotes",
+            "complaints",
+            ["cluster_id", sa.text("upvotes DESC"), "id"],
+            postgresql_where=sa.text("cluster_id IS NOT NULL"),
+            postgresql_concurrently=True,
+        )
+        op.drop_index("ix_complaints_cluster_id", table_name="complaints", postgresql_concurrently=True)
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.create_index("ix_complaints_cluster_id", "complaints", ["cluster_id"], postgresql_concurrently=True)
+        op.drop_index("ix_complaints_cluster_upvotes", table_name="complaints", postgresql_concurrently=True)
@@ -0,0 +1,22 @@
+"""reorder the upvotes primary key to (complaint_id, user_id)
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-15
+"""
+from alembic import op
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.drop_constraint("upvotes_pkey", "upvotes", type_="primary")
+    op.create_primary_key("upvotes_pkey", "upvotes", ["complaint_id", "user_id"])
+
+
+def downgrade():
+    op.drop_constraint("upvotes_pkey", "upvotes", type_="primary")
+    op.create_primary_key("upvotes_pkey", "upvotes", ["user_id", "complaint_id"])
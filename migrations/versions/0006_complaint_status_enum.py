@@ -0,0 +1,61 @@
+"""store complaints.status as the complaint_status enum with a partial pending index
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-15
+"""
+from alembic import context, op
+import sqlalchemy as sa
+
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+STATUSES = ("Pending", "InProgress", "Resolved", "Rejected")
+
+
+def upgrade():
+    # The status endpoint used to accept any string. Map spelling variants of the
+    # four statuses ("resolved", "In Progress", "in_progress", ...) onto them.
+    op.execute(
+        "UPDATE complaints SET status = CASE lower(replace(replace(trim(status), ' ', ''), '_', '')) "
+        "WHEN 'pending' THEN 'Pending' WHEN 'inprogress' THEN 'InProgress' "
+        "WHEN 'resolved' THEN 'Resolved' WHEN 'rejected' THEN 'Rejected' ELSE status END "
+        "WHERE status NOT IN ('Pending', 'InProgress', 'Resolved', 'Rejected')"
+    )
+    op.execute("UPDATE complaints SET status = 'Pending' WHERE status IS NULL")
+    if not context.is_offline_mode():
+        unknown = op.get_bind().execute(
+            sa.text("SELECT DISTINCT status FROM complaints WHERE status NOT IN :statuses").bindparams(
+                sa.bindparam("statuses", STATUSES, expanding=True)
+            )
+        ).scalars().all()
+        if unknown:
+            raise RuntimeError(
+                f"complaints.status has values outside {', '.join(STATUSES)}: {', '.join(map(repr, unknown))}. "
+                "Update those rows to one of the supported statuses and run the migration again."
+            )
+
+    op.execute("CREATE TYPE complaint_status AS ENUM ('Pending', 'InProgress', 'Resolved', 'Rejected')")
+    op.drop_index("ix_complaints_status_upvotes_desc", table_name="complaints")
+    op.alter_column(
+        "complaints",
+        "status",
+        type_=sa.Enum(*STATUSES, name="complaint_status", create_type=False),
+        postgresql_using="status::complaint_status",
+        nullable=False,
+    )
+    op.create_index(
+        "ix_complaints_pending_upvotes_desc",
+        "complaints",
+        [sa.text("upvotes DESC")],
+        postgresql_where=sa.text("status = 'Pending'"),
+    )
+
+
+def downgrade():
+    op.drop_index("ix_complaints_pending_upvotes_desc", table_name="complaints")
+    op.alter_column("complaints", "status", type_=sa.String(), postgresql_using="status::text", nullable=True)
+    op.execute("DROP TYPE complaint_status")
+    op.create_index("ix_complaints_status_upvotes_desc", "complaints", ["status", sa.text("upvotes DESC")])
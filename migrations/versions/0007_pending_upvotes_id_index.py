@@ -0,0 +1,38 @@
+"""extend the pending partial index to (upvotes DESC, id DESC) for keyset paging
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-15
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # CONCURRENTLY cannot run inside the migration transaction.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_complaints_pending_upvotes_id_desc",
+            "complaints",
+            [sa.text("upvotes DESC"), sa.text("id DESC")],
+            postgresql_where=sa.text("status = 'Pending'"),
+            postgresql_concurrently=True,
+        )
+        op.drop_index("ix_complaints_pending_upvotes_desc", table_name="complaints", postgresql_concurrently=True)
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_complaints_pending_upvotes_desc",
+            "complaints",
+            [sa.text("upvotes DESC")],
+            postgresql_where=sa.text("status = 'Pending'"),
+            postgresql_concurrently=True,
+        )
+        op.drop_index("ix_complaints_pending_upvotes_id_desc", table_name="complaints", postgresql_concurrently=True)
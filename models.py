@@ -1,47 +1,98 @@
 # models.py
+import os
+import time
 import uuid
-from sqlalchemy import Column, String, Integer, ForeignKey, Boolean, DateTime, Float
+from sqlalchemy import Column, String, Integer, BigInteger, ForeignKey, Boolean, DateTime, Float, Index, Computed, Enum, func
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.postgresql import UUID
-from datetime import datetime
+from geoalchemy2 import Geography
 
 from database import Base
 
+def uuid7() -> uuid.UUID:
+    """
+    Time-ordered UUID (RFC 9562 version 7): a 48-bit Unix millisecond timestamp
+    followed by random bits, so new keys land on the right-most B-tree pages.
+    """
+    timestamp_ms = time.time_ns() // 1_000_000
+    rand = int.from_bytes(os.urandom(10), "big")
+    rand_a, rand_b = rand >> 68, rand & ((1 << 62) - 1)
+    return uuid.UUID(int=(timestamp_ms & ((1 << 48) - 1)) << 80 | 0x7 << 76 | rand_a << 64 | 0b10 << 62 | rand_b)
+
+complaint_status = Enum("Pending", "InProgress", "Resolved", "Rejected", name="complaint_status")
+
 class Upvote(Base):
     __tablename__ = 'upvotes'
+    # complaint_id leads the primary key so a complaint's votes are one range scan.
+    complaint_id = Column(BigInteger, ForeignKey('complaints.pk'), primary_key=True)
     user_id = Column(UUID(as_uuid=True), ForeignKey('users.id'), primary_key=True)
-    complaint_id = Column(UUID(as_uuid=True), ForeignKey('complaints.id'), primary_key=True)
+
+
+class City(Base):
+    __tablename__ = "cities"
+    # Normalised (lower-cased) city name as sent to the geocoding API
+    name = Column(String, primary_key=True)
+    latitude = Column(Float, nullable=False)
+    longitude = Column(Float, nullable=False)
 
 
 class User(Base):
     __tablename__ = "users"
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     username = Column(String, unique=True, index=True)
     password = Column(String)
     is_admin = Column(Boolean, default=False)
-    complaints = relationship("Complaint", back_populates="owner", foreign_keys="[Complaint.owner_id]")
+    # Always serialized with the user; other relationships raise on lazy load to expose N+1s.
+    complaints = relationship("Complaint", back_populates="owner", foreign_keys="[Complaint.owner_id]", lazy="selectin")
 
 
 class Complaint(Base):
     __tablename__ = "complaints"
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    # Compact internal key for indexes and FKs; the UUID stays the public identifier.
+    pk = Column(BigInteger, primary_key=True)
+    id = Column(UUID(as_uuid=True), unique=True, index=True, nullable=False, default=uuid7)
     description = Column(String, index=True)
     category = Column(String, index=True)
     location = Column(String)
     upvotes = Column(Integer, default=0)
-    status = Column(String, default="Pending")
-    created_at = Column(DateTime, default=datetime.utcnow)
+    status = Column(complaint_status, default="Pending", nullable=False)
+    # Set by Postgres and fetched back through the INSERT's RETURNING clause.
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     
     # --- NEW: Fields for Geolocation and Clustering ---
     latitude = Column(Float, nullable=True)
     longitude = Column(Float, nullable=True)
+    # PostGIS point generated by the database from latitude/longitude (NULL until geocoded).
+    geom = Column(
+        Geography(geometry_type="POINT", srid=4326, spatial_index=False),
+        Computed("ST_SetSRID(ST_MakePoint(longitude, latitude), 4326)::geography", persisted=True),
+    )
     
     # Self-referencing FK for clustering. This complaint belongs to the cluster identified by cluster_id.
     cluster_id = Column(UUID(as_uuid=True), ForeignKey("complaints.id"), nullable=True)
     
     owner_id = Column(UUID(as_uuid=True), ForeignKey("users.id"))
-    owner = relationship("User", back_populates="complaints", foreign_keys=[owner_id])
+    owner = relationship("User", back_populates="complaints", foreign_keys=[owner_id], lazy="raise")
     
     # Defines the one-to-many relationship for a cluster parent to its children
-    cluster_children = relationship("Complaint", back_populates="cluster_parent", cascade="all, delete-orphan")
-    cluster_parent = relationship("Complaint", back_populates="cluster_children", remote_side=[id])
\ No newline at end of file
+    cluster_children = relationship(
+        "Complaint", back_populates="cluster_parent", cascade="all, delete-orphan", lazy="raise",
+        order_by=lambda: (Complaint.upvotes.desc(), Complaint.id),
+    )
+    cluster_parent = relationship("Complaint", back_populates="cluster_children", remote_side=[id], lazy="raise")
+
+    upvoters = relationship("User", secondary="upvotes", viewonly=True, lazy="raise")
+
+    __table_args__ = (
+        # Pending list and most-voted, without sorting
+        Index("ix_complaints_pending_upvotes_id_desc", upvotes.desc(), id.desc(), postgresql_where=status == "Pending"),
+        # Keyset pagination order for /complaints
+        Index("ix_complaints_upvotes_id_desc", upvotes.desc(), id.desc()),
+        # Radius searches (ST_DWithin) for clustering; SP-GiST is smaller than GiST for points.
+        Index("ix_complaints_geom_spgist", geom, postgresql_using="spgist"),
+        # A cluster's members in leaderboard order; unclustered rows are left out
+        Index(
+            "ix_complaints_cluster_upvotes", cluster_id, upvotes.desc(), id,
+            postgresql_where=cluster_id.isnot(None),
+        ),
+    )
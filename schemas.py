@@ -1,10 +1,14 @@
 # schemas.py
 import uuid
-from pydantic import BaseModel
-from typing import List, Optional
+from collections.abc import Mapping
+from pydantic import BaseModel, ConfigDict
+from typing import List, Literal, Optional
 from datetime import datetime
 
 # --- Complaint Schemas ---
+# Mirrors the complaint_status enum in models.py.
+ComplaintStatus = Literal["Pending", "InProgress", "Resolved", "Rejected"]
+
 class ComplaintBase(BaseModel):
     description: str
     category: str
@@ -16,15 +20,28 @@ class ComplaintCreate(ComplaintBase):
 class Complaint(ComplaintBase):
     id: uuid.UUID
     upvotes: int
-    status: str
+    status: ComplaintStatus
     owner_id: uuid.UUID
     created_at: datetime
     latitude: Optional[float] = None
     longitude: Optional[float] = None
     cluster_id: Optional[uuid.UUID] = None
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, frozen=True)
+
+    # Rows read back from the database are already valid, so skip validation.
+    @classmethod
+    def from_orm_fast(cls, obj) -> "Complaint":
+        # Every field is read, so a missing column raises instead of being left out.
+        if isinstance(obj, Mapping):
+            return cls.model_construct(**{name: obj[name] for name in cls.model_fields})
+        return cls.model_construct(**{name: getattr(obj, name) for name in cls.model_fields})
+
+class ComplaintPage(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
+    items: List[Complaint]
+    next_cursor: Optional[str] = None
 
 # --- User Schemas ---
 class UserBase(BaseModel):
@@ -38,8 +55,16 @@ class User(UserBase):
     is_admin: bool
     complaints: List[Complaint] = []
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, frozen=True)
+
+    @classmethod
+    def from_orm_fast(cls, obj) -> "User":
+        return cls.model_construct(
+            id=obj.id,
+            username=obj.username,
+            is_admin=obj.is_admin,
+            complaints=[Complaint.from_orm_fast(c) for c in obj.complaints],
+        )
 
 # --- Other Request/Response Schemas ---
 class LoginRequest(BaseModel):
@@ -53,13 +78,23 @@ class UndoRequest(BaseModel):
     admin_id: uuid.UUID
 
 class AdminActionResponse(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     updated_complaint: Complaint
     actions_to_undo: int
 
+    @classmethod
+    def from_orm_fast(cls, complaint, actions_to_undo: int) -> "AdminActionResponse":
+        return cls.model_construct(updated_complaint=Complaint.from_orm_fast(complaint), actions_to_undo=actions_to_undo)
+
 # --- NEW: Schemas for Clustering Feature ---
 class ClusterRequest(BaseModel):
     radius_km: float
+    # "fast" measures on a sphere, "accurate" on the WGS84 spheroid (<1% apart at city scale)
+    precision: Literal["fast", "accurate"] = "fast"
 
 class ClusteredComplaintResponse(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     parent: Complaint
-    children: List[Complaint]
\ No newline at end of file
+    children: List[Complaint]
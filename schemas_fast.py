@@ -0,0 +1,48 @@
+# schemas_fast.py
+# msgspec mirrors of the list response schemas; they must match schemas.py.
+import uuid
+from collections.abc import Mapping
+from datetime import datetime
+from typing import List, Optional
+
+import msgspec
+
+import schemas
+from schemas import ComplaintStatus
+
+class ComplaintOut(msgspec.Struct, frozen=True):
+    id: uuid.UUID
+    description: str
+    category: str
+    location: str
+    upvotes: int
+    status: ComplaintStatus
+    owner_id: uuid.UUID
+    created_at: datetime
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
+    cluster_id: Optional[uuid.UUID] = None
+
+    @classmethod
+    def from_row(cls, obj) -> "ComplaintOut":
+        """Accepts a row mapping or an ORM Complaint."""
+        if isinstance(obj, Mapping):
+            return cls(**{name: obj[name] for name in cls.__struct_fields__})
+        return cls(**{name: getattr(obj, name) for name in cls.__struct_fields__})
+
+# COMPLAINT_COLUMNS comes from the Pydantic fields and from_row reads the struct's, so they must agree.
+if set(ComplaintOut.__struct_fields__) != set(schemas.Complaint.model_fields):
+    raise TypeError(
+        "schemas_fast.ComplaintOut and schemas.Complaint have different fields: "
+        f"{sorted(set(ComplaintOut.__struct_fields__) ^ set(schemas.Complaint.model_fields))}"
+    )
+
+class ComplaintPageOut(msgspec.Struct, frozen=True):
+    items: List[ComplaintOut]
+    next_cursor: Optional[str] = None
+
+class ClusteredComplaintOut(msgspec.Struct, frozen=True):
+    parent: ComplaintOut
+    children: List[ComplaintOut]
+
+encoder = msgspec.json.Encoder()
@@ -46,6 +46,14 @@ class Trie {
 
 let pendingComplaintsTrie = new Trie();
 let allPendingComplaints = [];
+// The pending and resolved lists are paged separately: each keeps the complaints
+// loaded so far (in server order) and the cursor for its next page.
+const PAGE_SIZE = 50;
+const MAX_PAGE_SIZE = 500;
+const complaintLists = {
+    pending: { statuses: ['Pending'], items: [], cursor: null },
+    resolved: { statuses: ['InProgress', 'Resolved', 'Rejected'], items: [], cursor: null },
+};
 
 // --- Helper & Navigation Functions ---
 function updateUndoButtonVisibility(actions_to_undo) {
@@ -148,33 +156,32 @@ async function fetchAllData() {
     fetchMostVoted();
 }
 
+async function fetchComplaintsPage(list, cursor, limit = PAGE_SIZE) {
+    const params = new URLSearchParams({ limit });
+    list.statuses.forEach(status => params.append('status', status));
+    if (cursor) { params.set('cursor', cursor); }
+    const response = await fetch(`${API_URL}/complaints?${params}`);
+    if (!response.ok) {
+        // If the server responds with an error (like 404 or 500)
+        throw new Error(`HTTP error! status: ${response.status}`);
+    }
+    return response.json();
+}
+
+// Reloads both lists from the top. A list the user has already paged through is
+// reloaded to the same length (up to MAX_PAGE_SIZE), so a refresh doesn't drop
+// them back to the first page.
 async function fetchComplaints() {
     try {
-        const response = await fetch(`${API_URL}/complaints`);
-        if (!response.ok) {
-            // If the server responds with an error (like 404 or 500)
-            throw new Error(`HTTP error! status: ${response.status}`);
-        }
-        const complaints = await response.json();
-
-        allPendingComplaints = complaints.filter(c => c.status === 'Pending');
-        const resolvedComplaints = complaints.filter(c => c.status !== 'Pending');
-
-        pendingComplaintsTrie = new Trie();
-        allPendingComplaints.forEach(c => {
-            if (c.location) { pendingComplaintsTrie.insert(c.location); }
-        });
-
-        document.getElementById('pending-search-input').value = '';
-        renderPendingComplaints(allPendingComplaints);
-
-        const resolvedList = document.getElementById('resolved-complaints-list');
-        resolvedList.innerHTML = '';
-        if (resolvedComplaints.length === 0) {
-            resolvedList.innerHTML = '<p class="text-gray-500">No issues have been resolved yet.</p>';
-        } else {
-            resolvedComplaints.forEach(c => resolvedList.appendChild(createComplaintCard(c)));
-        }
+        await Promise.all(Object.values(complaintLists).map(async list => {
+            const limit = Math.min(MAX_PAGE_SIZE, Math.max(PAGE_SIZE, list.items.length));
+            const page = await fetchComplaintsPage(list, null, limit);
+            list.items = page.items;
+            list.cursor = page.next_cursor;
+        }));
+
+        renderPendingList();
+        renderResolvedList();
         
         if (currentUser && currentUser.is_admin) {
             fetchAndRenderClusters();
@@ -189,6 +196,65 @@ async function fetchComplaints() {
         lucide.createIcons();
     }
 }
+
+async function loadMoreComplaints(name) {
+    const list = complaintLists[name];
+    if (!list.cursor) return;
+    try {
+        const page = await fetchComplaintsPage(list, list.cursor);
+        // Vote counts can change between page fetches, so a complaint may show up twice.
+        const seen = new Set(list.items.map(c => c.id));
+        list.items = list.items.concat(page.items.filter(c => !seen.has(c.id)));
+        list.cursor = page.next_cursor;
+        if (name === 'pending') { renderPendingList(); } else { renderResolvedList(); }
+    } catch (error) {
+        console.error("Failed to load more complaints:", error);
+    } finally {
+        lucide.createIcons();
+    }
+}
+
+function renderPendingList() {
+    allPendingComplaints = complaintLists.pending.items;
+
+    // The location search only covers pending complaints loaded so far.
+    pendingComplaintsTrie = new Trie();
+    allPendingComplaints.forEach(c => {
+        if (c.location) { pendingComplaintsTrie.insert(c.location); }
+    });
+    applyPendingSearch();
+
+    document.getElementById('load-more-pending-btn').classList.toggle('hidden', !complaintLists.pending.cursor);
+}
+
+function renderResolvedList() {
+    const resolvedComplaints = complaintLists.resolved.items;
+    const resolvedList = document.getElementById('resolved-complaints-list');
+    resolvedList.innerHTML = '';
+    if (resolvedComplaints.length === 0) {
+        resolvedList.innerHTML = '<p class="text-gray-500">No issues have been resolved yet.</p>';
+    } else {
+        resolvedComplaints.forEach(c => resolvedList.appendChild(createComplaintCard(c)));
+    }
+
+    document.getElementById('load-more-resolved-btn').classList.toggle('hidden', !complaintLists.resolved.cursor);
+}
+
+// Renders the pending list filtered by whatever is in the location search box.
+function applyPendingSearch() {
+    const prefix = document.getElementById('pending-search-input').value;
+    if (!prefix) {
+        renderPendingComplaints(allPendingComplaints);
+        return;
+    }
+    const matchingLocations = pendingComplaintsTrie.findAllWithPrefix(prefix);
+    const locationSet = new Set(matchingLocations);
+    const filteredComplaints = allPendingComplaints.filter(c => 
+        locationSet.has(c.location)
+    );
+    renderPendingComplaints(filteredComplaints);
+}
+
 function renderPendingComplaints(complaintsToShow) {
     const pendingList = document.getElementById('pending-complaints-list');
     pendingList.innerHTML = '';
@@ -302,7 +368,10 @@ async function fetchAndRenderClusters() {
 // --- Other Handlers ---
 async function fetchMostVoted() {
     const response = await fetch(`${API_URL}/complaints/most_voted`);
-    const complaint = await response.json();
+    renderMostVoted(await response.json());
+}
+
+function renderMostVoted(complaint) {
     const el = document.getElementById('most-voted-complaint');
     if (complaint) {
         el.innerHTML = `<strong>(${complaint.upvotes} votes) ${complaint.category}:</strong> ${complaint.description}`;
@@ -323,9 +392,21 @@ async function handleUpvote(id) {
     if (!response.ok) {
         const error = await response.json();
         alert(`Vote failed: ${error.detail}`);
+        fetchAllData();
+        return;
     }
 
-    fetchAllData();
+    // The listings read vote counts the server refreshes every few seconds, so
+    // refetching now would show the old count. Apply the live count returned by
+    // the vote instead, keeping the server's order (upvotes, then id, descending).
+    const updated = await response.json();
+    const pending = complaintLists.pending;
+    pending.items = pending.items.map(c => c.id === updated.id ? updated : c);
+    pending.items.sort((a, b) => b.upvotes - a.upvotes || (a.id < b.id ? 1 : a.id > b.id ? -1 : 0));
+    renderPendingList();
+    // The pending list starts from the top, so its first entry is the most voted.
+    renderMostVoted(allPendingComplaints[0]);
+    lucide.createIcons();
 }
 
 async function handleResolve(complaintId) {
@@ -471,19 +552,8 @@ document.addEventListener('DOMContentLoaded', () => {
         globalClusterBtn.addEventListener('click', handleGlobalClusterRequest);
     }
 
-    document.getElementById('pending-search-input').addEventListener('input', (e) => {
-        const prefix = e.target.value;
-        if (!prefix) {
-            renderPendingComplaints(allPendingComplaints);
-            lucide.createIcons();
-            return;
-        }
-        const matchingLocations = pendingComplaintsTrie.findAllWithPrefix(prefix);
-        const locationSet = new Set(matchingLocations);
-        const filteredComplaints = allPendingComplaints.filter(c => 
-            locationSet.has(c.location)
-        );
-        renderPendingComplaints(filteredComplaints);
+    document.getElementById('pending-search-input').addEventListener('input', () => {
+        applyPendingSearch();
         lucide.createIcons();
     });
 });
\ No newline at end of file
@@ -0,0 +1,35 @@
+import numpy as np
+
+from geo_kernels import group_connected
+
+def edges(pairs):
+    src, dst = zip(*pairs)
+    return np.array(src, dtype=np.int64), np.array(dst, dtype=np.int64)
+
+def normalise(groups):
+    return {root: sorted(members) for root, members in groups.items()}
+
+def test_no_edges():
+    empty = np.array([], dtype=np.int64)
+    assert group_connected(empty, empty) == {}
+
+def test_chain_is_one_group_rooted_at_the_smallest_key():
+    # Listed out of order so the roots are merged in both directions.
+    src, dst = edges([(40, 50), (30, 40), (10, 20), (20, 30)])
+    assert normalise(group_connected(src, dst)) == {10: [10, 20, 30, 40, 50]}
+
+def test_disjoint_components():
+    src, dst = edges([(7, 3), (3, 9), (100, 42), (5, 6)])
+    assert normalise(group_connected(src, dst)) == {3: [3, 7, 9], 42: [42, 100], 5: [5, 6]}
+
+def test_repeated_and_reversed_edges():
+    src, dst = edges([(1, 2), (1, 2), (2, 1), (2, 3), (3, 2)])
+    groups = group_connected(src, dst)
+    assert normalise(groups) == {1: [1, 2, 3]}
+    # Each member appears once even though its edges repeat.
+    assert len(groups[1]) == 3
+
+def test_members_are_plain_ints():
+    src, dst = edges([(1, 2)])
+    (root, members), = group_connected(src, dst).items()
+    assert type(root) is int and all(type(m) is int for m in members)
@@ -0,0 +1,26 @@
+import time
+import uuid
+
+from models import uuid7
+
+def test_uuid7_version_and_variant():
+    value = uuid7()
+    assert value.version == 7
+    assert value.variant == uuid.RFC_4122
+    assert (value.int >> 62) & 0b11 == 0b10
+
+def test_uuid7_embeds_the_millisecond_timestamp():
+    before = time.time_ns() // 1_000_000
+    value = uuid7()
+    after = time.time_ns() // 1_000_000
+    assert before <= value.int >> 80 <= after
+
+def test_uuid7_sorts_by_creation_time():
+    first = uuid7()
+    time.sleep(0.002)
+    second = uuid7()
+    assert first < second
+    assert first.int >> 80 < second.int >> 80
+
+def test_uuid7_is_unique():
+    assert len({uuid7() for _ in range(1000)}) == 1000